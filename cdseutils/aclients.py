@@ -0,0 +1,175 @@
+"""Asynchronous client classes for CDSE services.
+
+The implementation is based on the `httpx` package.
+"""
+
+import os
+import asyncio
+import logging
+import pathlib
+import contextlib
+from types import MappingProxyType
+from collections.abc import Iterator
+
+import httpx
+from tqdm.auto import tqdm
+
+from .aioauth import AsyncTokenType, AsyncCdseSession
+from .clients import (
+    ESaveMode,
+    CdseODataClient,
+    _part_path,
+    _state_path,
+    _resolve_path,
+    _get_filename_from_headers,
+)
+
+_log = logging.getLogger(__name__)
+
+
+class AsyncCdseODataClient:
+    """Asynchronous OData client for CDSE.
+
+    Additional keyword arguments are passed to the `AsyncCdseSession`
+    constructor.
+    """
+
+    DEFAULT_CHUNK_SIZE = CdseODataClient.DEFAULT_CHUNK_SIZE
+    # NOTE: "Connection" is not set, it is not allowed in HTTP/2 and httpx
+    # keeps connections alive anyway
+    DOWNLOAD_HEADERS = MappingProxyType({"Accept-Encoding": "identity"})
+
+    def __init__(self, token: AsyncTokenType | None = None, **kwargs):
+        self.session = AsyncCdseSession(token, **kwargs)
+        # temporary files of the downloads in progress
+        self._active_paths: set[pathlib.Path] = set()
+
+    @contextlib.contextmanager
+    def _claim(self, partpath: pathlib.Path) -> Iterator[None]:
+        """Reserve the temporary file `partpath` for the current download.
+
+        Same as `CdseODataClient._claim`.
+        NOTE: no lock is needed, downloads run in the same event loop.
+        """
+        if partpath in self._active_paths:
+            raise FileExistsError(
+                f"'{partpath}' is already used by another download"
+            )
+        self._active_paths.add(partpath)
+        try:
+            yield
+        finally:
+            self._active_paths.discard(partpath)
+
+    # https://documentation.dataspace.copernicus.eu/APIs/OData.html#product-download
+    async def download(
+        self,
+        url: str,
+        outfile: str | None = None,
+        *,
+        outdir: str | None = None,
+        chunk_size: int | None = DEFAULT_CHUNK_SIZE,
+        disable_progress: bool | None = None,
+        save_mode: ESaveMode = ESaveMode.NOT_OVERWRITE,
+    ):
+        """Download the file at the specified URL.
+
+        Same as `CdseODataClient.download`.
+        Writing each chunk of data to disk is performed in a separate
+        thread, overlapped with the reception of the next chunk.
+        """
+        outpath = None
+        if outfile:
+            outpath = _resolve_path(pathlib.Path(outfile), outdir, save_mode)
+            if outpath is None:
+                return
+
+        async with self.session.stream(
+            "GET", url, headers=self.DOWNLOAD_HEADERS
+        ) as response:
+            response.raise_for_status()
+
+            # Check if the request was successful
+            if response.status_code != 200:
+                raise RuntimeError(
+                    "Failed to download file. "
+                    f"Status code: {response.status_code}"
+                )
+
+            if outpath is None:
+                outfile = _get_filename_from_headers(response.headers)
+                outpath = _resolve_path(
+                    pathlib.Path(outfile), outdir, save_mode
+                )
+                if outpath is None:
+                    return
+
+            partpath = _part_path(outpath)
+            with self._claim(partpath):
+                outpath.parent.mkdir(exist_ok=True, parents=True)
+
+                data_size = int(response.headers.get("Content-Length", 0))
+                pbar = tqdm(
+                    desc=str(outfile),
+                    total=data_size,
+                    unit="B",
+                    unit_scale=True,
+                    unit_divisor=1024,
+                    disable=disable_progress,
+                )
+                # the temporary file is re-written from scratch
+                _state_path(partpath).unlink(missing_ok=True)
+                await self._write_stream(
+                    response, partpath, data_size, chunk_size, pbar
+                )
+                os.replace(partpath, outpath)
+
+    @staticmethod
+    async def _write_stream(
+        response: httpx.Response,
+        outpath: pathlib.Path,
+        data_size: int,
+        chunk_size: int | None,
+        pbar: tqdm,
+    ) -> None:
+        with open(outpath, "wb") as fd, pbar:
+            preallocated = False
+            if data_size > 0 and hasattr(os, "posix_fallocate"):
+                # reserve the disk space in advance to reduce fragmentation
+                try:
+                    os.posix_fallocate(fd.fileno(), 0, data_size)
+                except OSError as exc:
+                    _log.debug("unable to pre-allocate '%s': %s", outpath, exc)
+                else:
+                    preallocated = True
+
+            pending: asyncio.Future | None = None
+            try:
+                async for chunk in response.aiter_bytes(chunk_size):
+                    if pending is not None:
+                        await pending
+                    pending = asyncio.ensure_future(
+                        asyncio.to_thread(fd.write, chunk)
+                    )
+                    pbar.update(len(chunk))
+            finally:
+                # the file cannot be closed while a write is in progress
+                if pending is not None:
+                    await asyncio.wait([pending])
+                if preallocated:
+                    # the decoded data size can differ from "Content-Length",
+                    # moreover the file size shall always match the
+                    # downloaded data (also in case of failure)
+                    fd.truncate(fd.tell())
+            if pending is not None:
+                pending.result()
+
+    async def aclose(self):
+        """Close the underlying HTTP(S) session."""
+        await self.session.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.aclose()
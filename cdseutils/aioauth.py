@@ -0,0 +1,227 @@
+"""Asynchronous support classes for the authentication on the CDSE.
+
+The implementation is based on the `httpx` package.
+HTTP/2 is used if the optional `h2` package is available.
+"""
+
+import time
+import asyncio
+import logging
+import datetime
+import importlib.util
+from collections.abc import Sequence, AsyncGenerator
+
+import httpx
+
+from .cdseauth import (
+    DEFAULT_AUTH_SERVER_URL,
+    DEFAULT_TOKEN_EXPIRY_SKEW,
+    CdseToken,
+    CdseSession,
+    AuthenticationError,
+    _get_auth_data,
+)
+
+_log = logging.getLogger(__name__)
+
+_HAS_HTTP2 = importlib.util.find_spec("h2") is not None
+
+
+class AsyncCdseToken:
+    """Class for CDSE tokens management (asynchronous version).
+
+    Same as `CdseToken` but the token is retrieved (and updated)
+    asynchronously via an `httpx.AsyncClient`, at the first call of the
+    `get` coroutine.
+
+    If no `client` is specified, a new one is created and owned by the
+    token object; it can be closed using `aclose` or using the token as
+    an asynchronous context manager.
+    """
+
+    def __init__(
+        self,
+        username: str | None = None,
+        password: str | None = None,
+        *,
+        auth_server_url: str = DEFAULT_AUTH_SERVER_URL,
+        client: httpx.AsyncClient | None = None,
+        expiry_skew: datetime.timedelta = DEFAULT_TOKEN_EXPIRY_SKEW,
+        http2: bool = _HAS_HTTP2,
+    ):
+        auth = _get_auth_data(username, password, auth_server_url)
+
+        self._auth_server_url: str = auth_server_url
+        self._owns_client = client is None
+        if client is None:
+            client = httpx.AsyncClient(http2=http2, trust_env=False)
+        self._client = client
+        self._expiry_skew: float = expiry_skew.total_seconds()
+        self._auth_data = auth
+        self._access_token: str = ""
+        self._refresh_token: str = ""
+        self._access_deadline: float = time.monotonic()
+        self._refresh_deadline: float = self._access_deadline
+        self._lock = asyncio.Lock()
+
+    async def _core_get_access_token(self, auth_data: dict[str, str]):
+        # NOTE: the reference time is taken *before* sending the request:
+        # the token is issued by the server after this instant, so the
+        # computed deadlines can only be earlier than the actual ones
+        # (by at most one round trip), never later
+        now = time.monotonic()
+        response = await self._client.post(
+            self._auth_server_url,
+            data=auth_data,
+            follow_redirects=False,
+        )
+        if response.status_code != 200:
+            raise AuthenticationError(
+                f"unable to get the access token from {self._auth_server_url}"
+                f": {response.status_code} {response.text[:200]}"
+            )
+
+        data = response.json()
+
+        expires_in = int(data["expires_in"])
+        refresh_expires_in = int(data["refresh_expires_in"])
+
+        # NOTE: the skew is limited to half of the token lifetime
+        # (see `CdseToken._core_get_access_token`)
+        access_skew = min(self._expiry_skew, expires_in / 2)
+        refresh_skew = min(self._expiry_skew, refresh_expires_in / 2)
+
+        self._access_token = data["access_token"]
+        self._refresh_token = data["refresh_token"]
+        self._access_deadline = now + expires_in - access_skew
+        self._refresh_deadline = now + refresh_expires_in - refresh_skew
+
+    async def _get_access_token(self, username: str, password: str):
+        """Retrieve an access token from the authentication server."""
+        auth_data = {
+            **CdseToken._PASSWORD_GRANT,
+            "username": username,
+            "password": password,
+        }
+        await self._core_get_access_token(auth_data=auth_data)
+
+    async def _refresh_access_token(self):
+        """Refresh an access token from the authentication server."""
+        auth_data = {
+            **CdseToken._REFRESH_GRANT,
+            "refresh_token": self._refresh_token,
+        }
+        await self._core_get_access_token(auth_data=auth_data)
+
+    async def get(self) -> str:
+        """Return the (updated) authentication token string."""
+        if time.monotonic() < self._access_deadline:
+            return self._access_token
+
+        # only one task at a time is allowed to update the token,
+        # the others will use the updated one
+        async with self._lock:
+            now = time.monotonic()
+            if now < self._access_deadline:
+                return self._access_token
+            if now < self._refresh_deadline:
+                try:
+                    await self._refresh_access_token()
+                    return self._access_token
+                except AuthenticationError as exc:
+                    # the refresh token can be revoked before its expiration
+                    # (see `CdseToken.get`): fall back to the password grant
+                    _log.debug("unable to refresh the access token: %s", exc)
+                    self._refresh_deadline = now
+            await self._get_access_token(
+                self._auth_data.username, self._auth_data.password
+            )
+            return self._access_token
+
+    async def aclose(self):
+        """Close the underlying HTTP client (if owned by the token)."""
+        if self._owns_client:
+            await self._client.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.aclose()
+
+
+AsyncTokenType = str | AsyncCdseToken
+
+
+# https://www.python-httpx.org/advanced/authentication/#custom-authentication-schemes
+# Example::
+#   await client.get(url, auth=CdseAsyncAuth(token))
+class CdseAsyncAuth(httpx.Auth):
+    """Token based authentication compatible with the `httpx` package."""
+
+    def __init__(self, token: AsyncTokenType):
+        self._token = token
+
+    def sync_auth_flow(self, request):
+        """Add authorization headers to the input request."""
+        if isinstance(self._token, AsyncCdseToken):
+            raise TypeError(
+                f"{self._token.__class__.__name__} objects can only be used "
+                "with asynchronous clients"
+            )
+        request.headers["Authorization"] = f"Bearer {self._token}"
+        yield request
+
+    async def async_auth_flow(
+        self, request: httpx.Request
+    ) -> AsyncGenerator[httpx.Request, httpx.Response]:
+        """Add authorization headers to the input request."""
+        if isinstance(self._token, AsyncCdseToken):
+            token = await self._token.get()
+        else:
+            token = self._token
+        request.headers["Authorization"] = f"Bearer {token}"
+        yield request
+
+
+class AsyncCdseSession(httpx.AsyncClient):
+    """CDSE asynchronous HTTP(S) session based on the `httpx` package.
+
+    Asynchronous counterpart of `CdseSession`: redirections are followed
+    and the authentication information are preserved when redirecting to
+    the trusted CDSE domains.
+    """
+
+    DEFAULT_TRUSTED_DOMAINS: frozenset[str] = (
+        CdseSession.DEFAULT_TRUSTED_DOMAINS
+    )
+
+    def __init__(
+        self,
+        token: AsyncTokenType | None = None,
+        *,
+        trusted_domains: Sequence[str] | None = None,
+        http2: bool = _HAS_HTTP2,
+        **kwargs,
+    ):
+        kwargs.setdefault("follow_redirects", True)
+        auth = CdseAsyncAuth(token) if token is not None else None
+        super().__init__(auth=auth, http2=http2, **kwargs)
+        if trusted_domains is None:
+            trusted_domain_set = self.DEFAULT_TRUSTED_DOMAINS
+        else:
+            trusted_domain_set = frozenset(trusted_domains)
+        self.trusted_domains: frozenset[str] = trusted_domain_set
+
+    def _redirect_headers(
+        self, request: httpx.Request, url: httpx.URL, method: str
+    ) -> httpx.Headers:
+        headers = super()._redirect_headers(request, url, method)
+        if (
+            "Authorization" in request.headers
+            and "Authorization" not in headers
+            and url.scheme == "https"
+            and url.host in self.trusted_domains
+        ):
+            headers["Authorization"] = request.headers["Authorization"]
+        return headers
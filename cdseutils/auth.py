@@ -1,14 +1,16 @@
 """Authentication helpers."""
 
 import os
+import stat
 import netrc
 import pathlib
-from typing import NamedTuple, Union
+import functools
+from typing import NamedTuple
 from urllib.parse import urlparse
 from urllib.parse import ParseResult as Url
 
-PathType = Union[str, os.PathLike[str]]
-UrlType = Union[str, Url]
+PathType = str | os.PathLike[str]
+UrlType = str | Url
 
 
 class CredentialsNotFoundError(RuntimeError):
@@ -26,6 +28,13 @@ class AuthData(NamedTuple):
         return f"{klass}(username='{self.username}', password='*****')"
 
 
+@functools.lru_cache
+def _env_auth_keys(app_prefix: str = "") -> tuple[str, str]:
+    if app_prefix:
+        return f"{app_prefix}_USERNAME", f"{app_prefix}_PASSWORD"
+    return "USERNAME", "PASSWORD"
+
+
 def get_auth_from_env(
     dafault_username: str | None = None,
     dafault_password: str | None = None,
@@ -46,13 +55,7 @@ def get_auth_from_env(
     * APP_PASSWORD
 
     """
-    if app_prefix:
-        username_key = f"{app_prefix}_USERNAME"
-        password_key = f"{app_prefix}_PASSWORD"
-    else:
-        username_key = "USERNAME"
-        password_key = "PASSWORD"
-
+    username_key, password_key = _env_auth_keys(app_prefix)
     username = os.environ.get(username_key, dafault_username)
     password = os.environ.get(password_key, dafault_password)
 
@@ -65,6 +68,29 @@ def get_auth_from_env(
     return AuthData(username, password)
 
 
+@functools.lru_cache(maxsize=8)
+def _resolve_netrc_path(netrc_path: str) -> pathlib.Path:
+    return pathlib.Path(netrc_path).expanduser().resolve()
+
+
+@functools.lru_cache(maxsize=8)
+def _load_netrc(path: str, mtime_ns: int, size: int) -> netrc.netrc:
+    """Load and parse the "netrc" file at the specified (absolute) path.
+
+    Parsed databases are cached. The modification time and the size of
+    the file are part of the cache key, so that modified files are
+    re-loaded; call `clear_netrc_cache` to force re-loading the files
+    from disk anyway.
+    """
+    return netrc.netrc(path)
+
+
+def clear_netrc_cache() -> None:
+    """Clear the cache of parsed "netrc" files."""
+    _load_netrc.cache_clear()
+    _resolve_netrc_path.cache_clear()
+
+
 def get_auth_from_netrc(
     url: UrlType, netrc_path: PathType | None = None
 ) -> AuthData:
@@ -80,32 +106,42 @@ def get_auth_from_netrc(
        directory) if none of the above two options is used.
 
     The above three options are evaluated in order.
+
+    The contents of the "netrc" file are cached after the first access,
+    and re-loaded if the file is modified (see `clear_netrc_cache`).
     """
     if netrc_path is None:
         netrc_path = os.environ.get("NETRCFILE", "~/.netrc")
 
-    netrc_path = pathlib.Path(netrc_path).expanduser()
-    if not netrc_path.is_file():
+    netrc_path = _resolve_netrc_path(os.fspath(netrc_path))
+    try:
+        # NOTE: a single stat provides both the file type check and the
+        # cache key
+        st = netrc_path.stat()
+    except OSError:
+        st = None
+    if st is None or not stat.S_ISREG(st.st_mode):
         raise FileExistsError(f"'{netrc_path}' does not exists")
 
-    auth_db = netrc.netrc(netrc_path)
+    auth_db = _load_netrc(str(netrc_path), st.st_mtime_ns, st.st_size)
     if isinstance(url, str):
         url = urlparse(url)
 
-    if url.geturl() in auth_db.hosts:
-        key = url.geturl()
-    elif url.hostname in auth_db.hosts:
-        key = url.hostname
-    else:
-        raise CredentialsNotFoundError(
-            f"unable to get authentication credential for {url.geturl()}"
-        )
-    authdata = auth_db.authenticators(key)
-    if authdata is not None:
-        user, _, password = authdata
+    hosts = auth_db.hosts
+    full_url = url.geturl()
+    hostname = url.hostname
+    if full_url in hosts:
+        key = full_url
+    elif hostname is not None and hostname in hosts:
+        key = hostname
     else:
+        key = None
+
+    authdata = auth_db.authenticators(key) if key is not None else None
+    if authdata is None:
         raise CredentialsNotFoundError(
-            f"unable to get authentication credential for {url.geturl()}"
+            f"unable to get authentication credential for {full_url}"
         )
+    user, _, password = authdata
 
     return AuthData(user, password)
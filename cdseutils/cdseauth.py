@@ -4,17 +4,27 @@
 # see also
 # https://documentation.dataspace.copernicus.eu/APIs/S3.html#example-script-to-download-product-using-python
 
+import os
+import json
+import time
+import logging
+import pathlib
 import weakref
 import datetime
+import tempfile
 import warnings
-from typing import Union
+import threading
+from types import MappingProxyType
 from urllib.parse import urlparse
 from collections.abc import Sequence
 
 import requests
+from urllib3.util.retry import Retry
+from requests.adapters import HTTPAdapter
 
 from .auth import (
     AuthData,
+    PathType,
     CredentialsNotFoundError,
     get_auth_from_env,
     get_auth_from_netrc,
@@ -27,78 +37,245 @@ DEFAULT_AUTH_SERVER_URL: str = (
 DEFAULT_S3_KEY_SERVER_URL: str = (
     "https://s3-keys-manager.cloudferro.com/api/user/credentials"
 )
+DEFAULT_TOKEN_EXPIRY_SKEW = datetime.timedelta(seconds=30)
+DEFAULT_S3_EXPIRY_SKEW = datetime.timedelta(seconds=300)
+
+_log = logging.getLogger(__name__)
 
 
 class AuthenticationError(RuntimeError):
     """Authentication error."""
 
 
+def _new_http_session() -> requests.Session:
+    session = requests.Session()
+    retries = Retry(
+        total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504]
+    )
+    adapter = HTTPAdapter(
+        pool_connections=4, pool_maxsize=8, max_retries=retries
+    )
+    session.mount("https://", adapter)
+    # credentials are always provided explicitly, skip the lookup of
+    # "~/.netrc" and of proxy settings in the environment at each request.
+    # NOTE: this also disables "REQUESTS_CA_BUNDLE" and "CURL_CA_BUNDLE",
+    # users needing them shall pass their own session (see `CdseToken`)
+    session.trust_env = False
+    return session
+
+
+# HTTP(S) session shared by all the token and S3 credentials requests,
+# so that connections to the authentication servers are re-used
+_HTTP = _new_http_session()
+
+
+def get_default_token_cache_path() -> pathlib.Path:
+    """Return the default path of the on-disk token cache.
+
+    The cache file is located in the "cdseutils" sub-folder of the user
+    cache directory ("$XDG_CACHE_HOME" or "~/.cache").
+    """
+    cache_home = os.environ.get("XDG_CACHE_HOME") or "~/.cache"
+    return pathlib.Path(cache_home).expanduser() / "cdseutils" / "token.json"
+
+
+def _get_auth_data(
+    username: str | None, password: str | None, auth_server_url: str
+) -> AuthData:
+    if (username, password).count(None) == 1:
+        raise ValueError(
+            "both 'username' and 'password' input parameters are needed"
+        )
+
+    if username is not None and password is not None:
+        return AuthData(username=username, password=password)
+
+    try:
+        return get_auth_from_env(app_prefix="CDSE_")
+    except CredentialsNotFoundError:
+        return get_auth_from_netrc(url=auth_server_url)
+
+
 class CdseToken:
     """Class for CDSE tokens management.
 
     The token is automatically updated (or regenerated) what it expires.
+    Tokens are considered expired `expiry_skew` before their actual
+    expiration time, to avoid using tokens that expire while the request
+    is in flight.
+
+    If `cache_path` is specified, tokens are stored on disk and re-used
+    by subsequent `CdseToken` instances (e.g. in other processes) with
+    the same user and authentication server, as long as they are valid.
+    See also `get_default_token_cache_path`.
+
+    By default requests are sent using a shared session that ignores the
+    environment (`trust_env = False`): proxy settings ("HTTPS_PROXY",
+    etc.) and custom CA bundles ("REQUESTS_CA_BUNDLE", "CURL_CA_BUNDLE")
+    are not taken into account.
+    If they are needed (e.g. behind a TLS-intercepting proxy), pass a
+    suitably configured `requests.Session` via the `session` parameter.
     """
 
+    _PASSWORD_GRANT = MappingProxyType({
+        "client_id": "cdse-public",
+        "grant_type": "password",
+    })
+    _REFRESH_GRANT = MappingProxyType({
+        "client_id": "cdse-public",
+        "grant_type": "refresh_token",
+    })
+
     def __init__(
         self,
         username: str | None = None,
         password: str | None = None,
         *,
         auth_server_url: str = DEFAULT_AUTH_SERVER_URL,
+        session: requests.Session | None = None,
+        expiry_skew: datetime.timedelta = DEFAULT_TOKEN_EXPIRY_SKEW,
+        cache_path: PathType | None = None,
     ):
-        if (username, password).count(None) == 1:
-            raise ValueError(
-                "both 'username' and 'password' input parameters are needed"
-            )
-
-        if username is not None and password is not None:
-            auth = AuthData(username=username, password=password)
-        else:
-            try:
-                auth = get_auth_from_env(app_prefix="CDSE_")
-            except CredentialsNotFoundError:
-                auth = get_auth_from_netrc(url=auth_server_url)
+        auth = _get_auth_data(username, password, auth_server_url)
 
         self._auth_server_url: str = auth_server_url
+        self._session = session if session is not None else _HTTP
+        self._expiry_skew: float = expiry_skew.total_seconds()
         self._auth_data = auth
         self._access_token: str = ""
         self._refresh_token: str = ""
-        self._access_expiration_time = datetime.datetime.now(tz=datetime.UTC)
-        self._refresh_expiration_time = self._access_expiration_time
-
-        self._get_access_token(
-            self._auth_data.username, self._auth_data.password
+        # NOTE: expiration deadlines are expressed in terms of
+        # `time.monotonic()`, that is cheap to compute and not affected by
+        # system clock updates
+        self._access_deadline: float = time.monotonic()
+        self._refresh_deadline: float = self._access_deadline
+        self._lock = threading.Lock()
+        self._cache_path = (
+            pathlib.Path(cache_path).expanduser()
+            if cache_path is not None
+            else None
         )
 
-    def _core_get_access_token(self, auth_data: dict[str, str]):
-        now = datetime.datetime.now(tz=datetime.UTC)
+        if not self._load_cache():
+            self._get_access_token(
+                self._auth_data.username, self._auth_data.password
+            )
+
+    def _load_cache(self) -> bool:
+        """Load tokens from the on-disk cache.
+
+        Return `True` if a valid refresh token has been loaded.
+        """
+        if self._cache_path is None:
+            return False
+
         try:
-            response = requests.post(
-                self._auth_server_url,
-                data=auth_data,
-                verify=True,
-                allow_redirects=False,
+            data = json.loads(self._cache_path.read_bytes())
+            if (
+                data["auth_server_url"] != self._auth_server_url
+                or data["username"] != self._auth_data.username
+            ):
+                return False
+            access_token = data["access_token"]
+            refresh_token = data["refresh_token"]
+            access_expiration_time = float(data["access_expiration_time"])
+            refresh_expiration_time = float(data["refresh_expiration_time"])
+        except FileNotFoundError:
+            return False
+        except (OSError, ValueError, KeyError, TypeError) as exc:
+            _log.debug("unable to load the token cache: %s", exc)
+            return False
+
+        # convert wall-clock times into monotonic clock deadlines
+        offset = time.monotonic() - time.time()
+        refresh_deadline = refresh_expiration_time + offset
+        if refresh_deadline <= time.monotonic():
+            return False
+
+        self._access_token = access_token
+        self._refresh_token = refresh_token
+        self._access_deadline = access_expiration_time + offset
+        self._refresh_deadline = refresh_deadline
+        return True
+
+    def _save_cache(self):
+        """Atomically store the current tokens in the on-disk cache."""
+        if self._cache_path is None:
+            return
+
+        # convert monotonic clock deadlines into wall-clock times
+        offset = time.time() - time.monotonic()
+        data = {
+            "auth_server_url": self._auth_server_url,
+            "username": self._auth_data.username,
+            "access_token": self._access_token,
+            "refresh_token": self._refresh_token,
+            "access_expiration_time": self._access_deadline + offset,
+            "refresh_expiration_time": self._refresh_deadline + offset,
+        }
+
+        try:
+            self._cache_path.parent.mkdir(
+                mode=0o700, parents=True, exist_ok=True
+            )
+            # NOTE: the temporary file is only readable by the owner
+            fd, tmp_path = tempfile.mkstemp(
+                dir=self._cache_path.parent, suffix=".tmp"
             )
-            response.raise_for_status()
-        except requests.HTTPError as exc:
+            try:
+                with os.fdopen(fd, "w") as fp:
+                    json.dump(data, fp)
+                os.replace(tmp_path, self._cache_path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except OSError as exc:
+            _log.warning(
+                "unable to write the token cache '%s': %s",
+                self._cache_path,
+                exc,
+            )
+
+    def _core_get_access_token(self, auth_data: dict[str, str]):
+        # NOTE: the reference time is taken *before* sending the request:
+        # the token is issued by the server after this instant, so the
+        # computed deadlines can only be earlier than the actual ones
+        # (by at most one round trip), never later
+        now = time.monotonic()
+        response = self._session.post(
+            self._auth_server_url,
+            data=auth_data,
+            verify=True,
+            allow_redirects=False,
+        )
+        # NOTE: redirections are not followed, so anything different from
+        # 200 is an error (including 3xx). The response body is always
+        # read so that the connection is released to the pool.
+        if response.status_code != 200:
             raise AuthenticationError(
                 f"unable to get the access token from {self._auth_server_url}"
-            ) from exc
+                f": {response.status_code} {response.text[:200]}"
+            )
 
-        data = response.json()
+        # the payload is a small JSON document (UTF-8 encoded), decode it
+        # directly skipping the charset detection performed by
+        # `response.json()`
+        data = json.loads(response.content)
 
         expires_in = int(data["expires_in"])
         refresh_expires_in = int(data["refresh_expires_in"])
 
+        # NOTE: the skew is limited to half of the token lifetime,
+        # otherwise short-lived tokens would be considered expired as soon
+        # as they are issued
+        access_skew = min(self._expiry_skew, expires_in / 2)
+        refresh_skew = min(self._expiry_skew, refresh_expires_in / 2)
+
         self._access_token = data["access_token"]
         self._refresh_token = data["refresh_token"]
-        margin = 1  # second
-        self._access_expiration_time = now + datetime.timedelta(
-            seconds=expires_in - margin
-        )
-        self._refresh_expiration_time = now + datetime.timedelta(
-            seconds=refresh_expires_in - margin
-        )
+        self._access_deadline = now + expires_in - access_skew
+        self._refresh_deadline = now + refresh_expires_in - refresh_skew
+        self._save_cache()
 
     def _get_access_token(self, username: str, password: str):
         """Retrieve an access token from the authentication server.
@@ -106,8 +283,7 @@ class CdseToken:
         This token is used for subsequent API calls.
         """
         auth_data = {
-            "client_id": "cdse-public",
-            "grant_type": "password",
+            **self._PASSWORD_GRANT,
             "username": username,
             "password": password,
         }
@@ -116,30 +292,43 @@ class CdseToken:
     def _refresh_access_token(self):
         """Refresh an access token from the authentication server."""
         auth_data = {
-            "client_id": "cdse-public",
-            "grant_type": "refresh_token",
+            **self._REFRESH_GRANT,
             "refresh_token": self._refresh_token,
         }
         self._core_get_access_token(auth_data=auth_data)
 
     def get(self) -> str:
         """Return the (updated) authentication token string."""
-        now = datetime.datetime.now(tz=datetime.UTC)
-        if now < self._access_expiration_time:
+        if time.monotonic() < self._access_deadline:
             return self._access_token
-        if now < self._refresh_expiration_time:
-            self._refresh_access_token()
+
+        # only one thread at a time is allowed to update the token,
+        # the others will use the updated one
+        with self._lock:
+            now = time.monotonic()
+            if now < self._access_deadline:
+                return self._access_token
+            if now < self._refresh_deadline:
+                try:
+                    self._refresh_access_token()
+                    return self._access_token
+                except AuthenticationError as exc:
+                    # the refresh token can be revoked before its expiration
+                    # (e.g. logout, session idle timeout, or rotation by
+                    # another process sharing the cache): fall back to the
+                    # password grant, that also overwrites the cached tokens
+                    _log.debug("unable to refresh the access token: %s", exc)
+                    self._refresh_deadline = now
+            self._get_access_token(
+                self._auth_data.username, self._auth_data.password
+            )
             return self._access_token
-        self._get_access_token(
-            self._auth_data.username, self._auth_data.password
-        )
-        return self._access_token
 
     def __str__(self) -> str:
         return self.get()
 
 
-TokenType = Union[str, CdseToken]
+TokenType = str | CdseToken
 
 
 # https://requests.readthedocs.io/en/latest/user/advanced/#custom-authentication
@@ -150,15 +339,43 @@ class CdseAuth(requests.auth.AuthBase):
 
     def __init__(self, token: TokenType):
         self._token = token
+        # (token string, authorization header value) of the last request
+        self._last_auth: tuple[str, bytes] = ("", b"")
 
     # https://documentation.dataspace.copernicus.eu/APIs/OData.html#product-download
     def __call__(self, prepared_request):
         """Add authorization headers to the input request."""
-        headers = {"Authorization": f"Bearer {self._token}"}
-        prepared_request.headers.update(headers)
+        token = str(self._token)
+        last_token, header = self._last_auth
+        if token != last_token:
+            header = b"Bearer " + token.encode("ascii")
+            self._last_auth = (token, header)
+        prepared_request.headers["Authorization"] = header
         return prepared_request
 
 
+def _get_hostname(url: str) -> str | None:
+    """Return the (lower case) hostname of the input absolute URL.
+
+    Lightweight alternative to `urlparse(url).hostname`.
+    """
+    start = url.find("://")
+    if start < 0:
+        return urlparse(url).hostname
+    start += 3
+    end = len(url)
+    for sep in "/?#":
+        pos = url.find(sep, start, end)
+        if pos >= 0:
+            end = pos
+    netloc = url[start:end].rpartition("@")[2]
+    if netloc.startswith("["):
+        hostname = netloc[1 : netloc.find("]")]
+    else:
+        hostname = netloc.partition(":")[0]
+    return hostname.lower() or None
+
+
 # https://github.com/psf/requests/issues/2949
 # https://github.com/psf/requests/pull/4983
 class RedirectAuthSession(requests.Session):
@@ -185,20 +402,21 @@ class RedirectAuthSession(requests.Session):
         On top of the standard criteria this specialization of the method also
         takes into account the 'trusted_domains' specified by the user.
         """
-        old_parsed = urlparse(old_url)
-        new_parsed = urlparse(new_url)
+        old_hostname = _get_hostname(old_url)
+        new_hostname = _get_hostname(new_url)
+
+        if old_hostname == new_hostname:
+            # nothing to do on top of the standard criteria
+            return super().should_strip_auth(old_url, new_url)
 
-        if (
-            old_parsed.hostname != new_parsed.hostname
-            and new_parsed.hostname not in self.trusted_domains
-        ):
+        if new_hostname not in self.trusted_domains:
             return True
 
         # replace the trusted hostname with the old one to be able to exploit
         # the base 'should_strip_auth' function
-        assert new_parsed.hostname
-        assert old_parsed.hostname
-        url = new_url.replace(new_parsed.hostname, old_parsed.hostname)
+        assert new_hostname
+        assert old_hostname
+        url = new_url.replace(new_hostname, old_hostname)
         return super().should_strip_auth(old_url, url)
 
 
@@ -214,25 +432,84 @@ class CdseSession(RedirectAuthSession):
         "download.dataspace.copernicus.eu",
     ])
 
-    def __init__(self, token: TokenType | None = None):
+    DEFAULT_POOL_CONNECTIONS = 16
+    DEFAULT_POOL_MAXSIZE = 32
+
+    def __init__(
+        self,
+        token: TokenType | None = None,
+        *,
+        pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+    ):
         super().__init__()
         if token is not None:
             self.auth = CdseAuth(token)
 
+        retries = Retry(
+            total=5,
+            backoff_factor=0.3,
+            status_forcelist=(500, 502, 503, 504),
+            allowed_methods=frozenset(["GET", "HEAD"]),
+        )
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=retries,
+        )
+        self.mount("https://", adapter)
+
 
 class CdseS3Credentials:
-    """Authentication credentials for the CDSE S3 bucket."""
+    """Authentication credentials for the CDSE S3 bucket.
+
+    Credentials are considered no longer valid `expiry_skew` before their
+    actual expiration date.
+
+    If `AUTOCLEANUP` is `True` (default), credentials are guaranteed to be
+    deleted from the server when the object is garbage collected or, at
+    the latest, when the interpreter exits.
+    Otherwise the cleanup is only guaranteed if the object is used as a
+    context manager.
+
+    As for `CdseToken`, the default session ignores proxy and CA bundle
+    settings in the environment ("HTTPS_PROXY", "REQUESTS_CA_BUNDLE",
+    etc.); use the `session` parameter to provide a configured
+    `requests.Session` if needed.
+    """
+
+    AUTOCLEANUP: bool = True
 
     def __init__(
         self,
         token: CdseToken,
         key_server_url: str = DEFAULT_S3_KEY_SERVER_URL,
+        session: requests.Session | None = None,
+        expiry_skew: datetime.timedelta = DEFAULT_S3_EXPIRY_SKEW,
     ):
         self._key_server_url = key_server_url
         self._token = token
-        credentials, expiration_date = self._get_s3_auth(key_server_url, token)
+        self._session = session if session is not None else _HTTP
+        credentials, expiration_date = self._get_s3_auth(
+            key_server_url, token, self._session
+        )
         self._credentials = credentials
         self._expiration_date = expiration_date
+        now = datetime.datetime.now(tz=datetime.UTC)
+        self._deadline: float = (
+            time.monotonic()
+            + (expiration_date - now).total_seconds()
+            - expiry_skew.total_seconds()
+        )
+
+        self._finalizer: weakref.finalize | None = None
+        self._deleted = False
+        if self.AUTOCLEANUP:
+            self._arm_finalizer()
+
+    def _arm_finalizer(self):
+        if self._finalizer is not None or self._deleted:
+            return
 
         # NOTE: weackref.finalize is used instead of `__del__` because the
         # `__del__` is not guaranteed to be called if the object still exists
@@ -244,8 +521,14 @@ class CdseS3Credentials:
             self._key_server_url,
             self._credentials,
             self._token,
+            self._session,
         )
 
+    def _is_alive(self) -> bool:
+        if self._finalizer is not None:
+            return self._finalizer.alive
+        return not self._deleted
+
     @property
     def access_id(self) -> str:
         """Access ID."""
@@ -270,14 +553,16 @@ class CdseS3Credentials:
 
     @staticmethod
     def _get_s3_auth(
-        key_server_url: str, token: TokenType
+        key_server_url: str,
+        token: TokenType,
+        session: requests.Session = _HTTP,
     ) -> tuple[AuthData, datetime.datetime]:
         """Create S3 credentials via S3 keys manager API."""
         headers = CdseS3Credentials._get_headers(token)
-        response = requests.post(key_server_url, headers=headers)
+        response = session.post(key_server_url, headers=headers)
         response.raise_for_status()
 
-        data = response.json()
+        data = json.loads(response.content)
         expiration_date = datetime.datetime.fromisoformat(
             data["expiration_date"]
         )
@@ -286,13 +571,16 @@ class CdseS3Credentials:
 
     @staticmethod
     def _delete_s3_credentials(
-        key_server_url: str, auth: AuthData, token: TokenType
+        key_server_url: str,
+        auth: AuthData,
+        token: TokenType,
+        session: requests.Session = _HTTP,
     ) -> None:
         """Delete the S3 credentials via S3 keys manager API."""
         url = f"{key_server_url}/access_id/{auth.username}"
         headers = CdseS3Credentials._get_headers(token)
 
-        response = requests.delete(url, headers=headers)
+        response = session.delete(url, headers=headers)
         if response.status_code != 204:
             warnings.warn(
                 f"Failed to delete S3 credentials {auth.username}. "
@@ -301,10 +589,20 @@ class CdseS3Credentials:
             )
 
     def _delete(self):
-        if self._finalizer.alive:
-            self._finalizer()
+        if self._finalizer is not None:
+            if self._finalizer.alive:
+                self._finalizer()
+        elif not self._deleted:
+            self._deleted = True
+            self._delete_s3_credentials(
+                self._key_server_url,
+                self._credentials,
+                self._token,
+                self._session,
+            )
 
     def __enter__(self):
+        self._arm_finalizer()
         return self
 
     def __exit__(self, exc_type, exc_value, traceback):
@@ -312,8 +610,7 @@ class CdseS3Credentials:
 
     def is_valid(self) -> bool:
         """Return `True` if the authentication credentials are valid."""
-        now = datetime.datetime.now(tz=datetime.UTC)
-        return self._finalizer.alive and (now < self._expiration_date)
+        return self._is_alive() and (time.monotonic() < self._deadline)
 
     def get(self) -> AuthData:
         """Return authentication credentials.
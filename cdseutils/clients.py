@@ -1,17 +1,41 @@
 """Client classes for CDSE services."""
 
-import re
+import os
 import enum
+import json
 import logging
 import pathlib
+import weakref
+import tempfile
 import warnings
+import threading
+import contextlib
+from email.message import Message
+from types import MappingProxyType
+from collections.abc import Mapping, Callable, Iterable, Iterator
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    FIRST_EXCEPTION,
+    Future,
+    ThreadPoolExecutor,
+    wait,
+)
 
+import requests
 from tqdm.auto import tqdm
+from urllib3.exceptions import (
+    SSLError,
+    DecodeError,
+    ProtocolError,
+    ReadTimeoutError,
+)
 
 from .cdseauth import CdseSession, TokenType
 
 _log = logging.getLogger(__name__)
 
+_HAS_PWRITE = hasattr(os, "pwrite")
+
 
 class ESaveMode(enum.StrEnum):
     """Mode for saving a file in case it already exists."""
@@ -21,59 +45,613 @@ class ESaveMode(enum.StrEnum):
     RAISE = "RAISE"
 
 
+def _get_filename_from_headers(headers) -> str:
+    content_disposition = headers.get("Content-Disposition", "")
+    if not content_disposition:
+        return ""
+
+    # NOTE: the parser of the standard library also supports RFC 2231
+    # encoded parameters (e.g. filename*=UTF-8''name.zip)
+    msg = Message()
+    msg["Content-Disposition"] = content_disposition
+    filename = msg.get_filename()
+    if filename:
+        # NOTE: only the final component is used, a name sent by the server
+        # shall never select the output directory (e.g. "../../name")
+        filename = pathlib.PurePath(filename).name
+    if not filename or filename == "..":
+        raise ValueError(
+            "no output file name specified and it is not possible to "
+            "derive it from the request headers"
+        )
+
+    return filename
+
+
+def _output_path(
+    path: pathlib.Path, outdir: str | None = None, stacklevel: int = 3
+) -> pathlib.Path:
+    """Return the output path (no check is performed on the filesystem)."""
+    if outdir is not None:
+        if path.is_absolute():
+            warnings.warn(
+                "an absolute path has been provided as input "
+                f"('{path}'), the 'outdir parameter' ('{outdir}') "
+                "will be ignored",
+                stacklevel=stacklevel,
+            )
+        return pathlib.Path(outdir) / path
+    return path
+
+
+def _check_path(
+    path: pathlib.Path, save_mode: ESaveMode = ESaveMode.RAISE
+) -> pathlib.Path | None:
+    """Return `path` or `None` if the download shall be skipped.
+
+    The download is skipped if the output file already exists and
+    `save_mode` is `ESaveMode.NOT_OVERWRITE`.
+    """
+    if path.exists():
+        if save_mode is ESaveMode.RAISE:
+            raise FileExistsError(
+                f"File or directory already exists: '{path}'"
+            )
+        if save_mode is ESaveMode.NOT_OVERWRITE:
+            _log.info("file '%s' already exists, skip download", path)
+            return None
+
+    return path
+
+
+def _resolve_path(
+    path: pathlib.Path,
+    outdir: str | None = None,
+    save_mode: ESaveMode = ESaveMode.RAISE,
+) -> pathlib.Path | None:
+    """Return the output path or `None` if the download shall be skipped.
+
+    See `_check_path`.
+    """
+    path = _output_path(path, outdir, stacklevel=4)
+    return _check_path(path, save_mode)
+
+
+def _part_path(path: pathlib.Path) -> pathlib.Path:
+    """Return the path of the temporary file used during the download."""
+    return path.with_name(f"{path.name}.part")
+
+
+def _state_path(partpath: pathlib.Path) -> pathlib.Path:
+    """Return the path of the file tracking the progress of a download."""
+    return partpath.with_name(f"{partpath.name}.json")
+
+
+@contextlib.contextmanager
+def _translate_read_errors() -> Iterator[None]:
+    """Re-raise urllib3 errors of `Response.raw.read` as requests errors.
+
+    The same mapping is applied by `requests.Response.iter_content`.
+    """
+    try:
+        yield
+    except ProtocolError as exc:
+        raise requests.exceptions.ChunkedEncodingError(exc) from exc
+    except DecodeError as exc:
+        raise requests.exceptions.ContentDecodingError(exc) from exc
+    except ReadTimeoutError as exc:
+        raise requests.exceptions.ConnectionError(exc) from exc
+    except SSLError as exc:
+        raise requests.exceptions.SSLError(exc) from exc
+
+
+def _contiguous_end(start: int, offsets: list[int], lasts: list[int]) -> int:
+    """Return the end of the data downloaded contiguously from `start`.
+
+    `offsets` and `lasts` are the current offsets and the last bytes of
+    the ranges being downloaded (see `CdseODataClient._download_range`).
+    """
+    end = start
+    for offset, last in zip(offsets, lasts, strict=True):
+        end = offset
+        if offset <= last:
+            break
+    return end
+
+
+def _get_validator(headers: Mapping[str, str]) -> str:
+    """Return the validator of the remote resource ("" if not available).
+
+    The validator can be used in the "If-Range" header of range requests.
+    NOTE: weak entity tags are not allowed in "If-Range".
+    """
+    etag = headers.get("ETag", "")
+    if etag and not etag.startswith("W/"):
+        return etag
+    return headers.get("Last-Modified", "")
+
+
+def _load_resume_offset(
+    partpath: pathlib.Path, size: int, validator: str
+) -> int:
+    """Return the offset from which a partial download can be resumed.
+
+    The offset is read from the state file of the download (see
+    `_save_resume_offset`), the size of the temporary file is not
+    reliable since disk space is pre-allocated.
+    Zero is returned if the state is missing, corrupted or if the remote
+    resource has changed.
+    """
+    try:
+        data = json.loads(_state_path(partpath).read_bytes())
+        end = int(data["end"])
+        if data["size"] != size or data["validator"] != validator:
+            _log.info("remote file changed, restart the download")
+            return 0
+        return min(end, partpath.stat().st_size)
+    except FileNotFoundError:
+        return 0
+    except (OSError, ValueError, KeyError, TypeError) as exc:
+        _log.debug("unable to load the download state: %s", exc)
+        return 0
+
+
+def _save_resume_offset(
+    partpath: pathlib.Path, size: int, validator: str, end: int
+) -> None:
+    """Atomically store the state of a partial download.
+
+    `end` is the amount of data already stored (and synchronized to
+    disk) contiguously from the beginning of `partpath`.
+    """
+    data = {"size": size, "validator": validator, "end": end}
+    statepath = _state_path(partpath)
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=statepath.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as fp:
+                json.dump(data, fp)
+            os.replace(tmp_path, statepath)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except OSError as exc:
+        _log.warning("unable to write the download state: %s", exc)
+
+
 class CdseODataClient:
     """OData client for CDSE."""
 
-    DEFAULT_CHUNK_SIZE = 8192
+    DEFAULT_CHUNK_SIZE = 1024 * 1024
+    DEFAULT_MAX_WORKERS = 4
+    # size of the blocks of written data that are dropped from the page cache
+    PAGE_CACHE_DROP_SIZE = 32 * 1024 * 1024
+    # interval (in seconds) between two checkpoints of range downloads
+    CHECKPOINT_INTERVAL = 5.0
+    # amount of downloaded data between two updates of the progress bar
+    PROGRESS_UPDATE_SIZE = 4 * 1024 * 1024
+    # products are already compressed (ZIP): ask the server not to re-encode
+    # them, so that "Content-Length" and byte ranges refer to the actual data
+    DOWNLOAD_HEADERS = MappingProxyType({
+        "Accept-Encoding": "identity",
+        "Connection": "keep-alive",
+    })
 
     def __init__(self, token: TokenType | None = None):
         self.session = CdseSession(token)
+        # NOTE: weackref.finalize is used instead of `__del__` to avoid
+        # issues at interpreter shutdown
+        self._finalizer = weakref.finalize(self, self.session.close)
+        # temporary files of the downloads in progress
+        self._active_paths: set[pathlib.Path] = set()
+        self._active_lock = threading.Lock()
 
-    @staticmethod
-    def _get_filename_from_headers(headers) -> str:
-        content_disposition = headers.get("Content-Disposition", str)
-        if not content_disposition:
-            return ""
-
-        mobj = re.match(
-            r"attachment;"
-            r"\s*"
-            r"""filename=(?P<quote>['"])?(?P<filename>.*)(?P=quote)?""",
-            content_disposition,
+    @contextlib.contextmanager
+    def _claim(self, partpath: pathlib.Path) -> Iterator[None]:
+        """Reserve the temporary file `partpath` for the current download.
+
+        Concurrent downloads of the same output file (e.g. in
+        `download_many`) would corrupt each other's temporary file.
+        """
+        with self._active_lock:
+            if partpath in self._active_paths:
+                raise FileExistsError(
+                    f"'{partpath}' is already used by another download"
+                )
+            self._active_paths.add(partpath)
+        try:
+            yield
+        finally:
+            with self._active_lock:
+                self._active_paths.discard(partpath)
+
+    def _open_stream(self, url: str) -> requests.Response:
+        response = self.session.get(
+            url, stream=True, headers=self.DOWNLOAD_HEADERS
         )
-        if not mobj:
-            raise ValueError(
-                "no output file name specified and it is not possible to "
-                "derive it from the request headers"
+        response.raise_for_status()
+
+        # Check if the request was successful
+        if response.status_code != 200:
+            response.close()
+            raise RuntimeError(
+                f"Failed to download file. Status code: {response.status_code}"
             )
 
-        return mobj.group("filename")
+        return response
+
+    def _head(self, url: str) -> tuple[int, bool, Mapping[str, str]]:
+        """Probe the remote resource.
+
+        Return the resource size (0 if unknown), a flag indicating whether
+        range requests are supported, and the response headers.
+
+        If the HEAD request fails (e.g. the method is not allowed), the
+        resource is probed requesting only its first byte.
+        """
+        response = self.session.head(
+            url, allow_redirects=True, headers=self.DOWNLOAD_HEADERS
+        )
+        if not response.ok:
+            _log.debug(
+                "HEAD request failed for '%s' (status code: %d)",
+                url,
+                response.status_code,
+            )
+            return self._probe_range(url)
+        headers = response.headers
+        size = int(headers.get("Content-Length", 0))
+        accept_ranges = headers.get("Accept-Ranges", "").lower() == "bytes"
+        return size, accept_ranges, headers
+
+    def _probe_range(self, url: str) -> tuple[int, bool, Mapping[str, str]]:
+        """Probe the remote resource with a GET request of the first byte.
+
+        See `_head`.
+        """
+        request_headers = {**self.DOWNLOAD_HEADERS, "Range": "bytes=0-0"}
+        # NOTE: the response body is not read, also if the server sends the
+        # entire resource
+        with self.session.get(
+            url, stream=True, headers=request_headers
+        ) as response:
+            response.raise_for_status()
+        headers = response.headers
+        if response.status_code != 206:
+            return int(headers.get("Content-Length", 0)), False, headers
+
+        # "Content-Range: bytes 0-0/<size>" (the size can be "*")
+        total = headers.get("Content-Range", "").rpartition("/")[2]
+        size = int(total) if total.isdigit() else 0
+        return size, True, headers
 
     @staticmethod
-    def _new_path(
-        outfile: str,
-        outdir: str | None = None,
-        save_mode: ESaveMode = ESaveMode.RAISE,
-    ) -> pathlib.Path:
-        assert outfile is not None
-        if outdir is not None:
-            if pathlib.Path(outfile).is_absolute():
-                warnings.warn(
-                    "an absolute path has been provided as input "
-                    f"('{outfile}'), the 'outdir parameter' ('{outdir}') "
-                    "will be ignored",
-                    stacklevel=3,
+    def _progress_bar(
+        desc: str,
+        total: int,
+        initial: int = 0,
+        disable: bool | None = None,
+        leave: bool = True,
+    ) -> tqdm:
+        return tqdm(
+            desc=desc,
+            total=total,
+            initial=initial,
+            unit="B",
+            unit_scale=True,
+            unit_divisor=1024,
+            disable=disable,
+            leave=leave,
+            mininterval=0.5,
+        )
+
+    def _download_range(
+        self,
+        url: str,
+        fd: int,
+        index: int,
+        offsets: list[int],
+        last: int,
+        validator: str,
+        chunk_size: int,
+        pbar: tqdm,
+        cancelled: threading.Event,
+    ) -> None:
+        """Download the byte range [offsets[index], last] of the resource.
+
+        Data are written in the `fd` file at the corresponding offset.
+        `offsets[index]` is updated as data are written.
+        """
+        headers = {
+            **self.DOWNLOAD_HEADERS,
+            "Range": f"bytes={offsets[index]}-{last}",
+        }
+        if validator:
+            # the server sends the entire resource if it has changed
+            headers["If-Range"] = validator
+        with (
+            self.session.get(url, stream=True, headers=headers) as response,
+            _translate_read_errors(),
+        ):
+            response.raise_for_status()
+            if response.status_code == 200 and validator:
+                raise RuntimeError(f"the remote file has changed: '{url}'")
+            if response.status_code != 206:
+                raise RuntimeError(
+                    "Failed to download file range. "
+                    f"Status code: {response.status_code}"
                 )
-            path = pathlib.Path(outdir) / outfile
-        else:
-            path = pathlib.Path(outfile)
 
-        if path.exists() and save_mode is ESaveMode.RAISE:
-            raise FileExistsError(
-                f"File or directory already exists: '{path}'"
+            raw = response.raw
+            update_size = self.PROGRESS_UPDATE_SIZE
+            reported = offsets[index]
+            try:
+                while not cancelled.is_set() and (
+                    chunk := raw.read(chunk_size)
+                ):
+                    data = memoryview(chunk)
+                    while data:
+                        size = os.pwrite(fd, data, offsets[index])
+                        offsets[index] += size
+                        data = data[size:]
+                    if offsets[index] - reported >= update_size:
+                        pbar.update(offsets[index] - reported)
+                        reported = offsets[index]
+            finally:
+                pbar.update(offsets[index] - reported)
+
+        if not cancelled.is_set() and offsets[index] != last + 1:
+            raise RuntimeError(
+                f"Incomplete download of range {headers['Range']!r}"
             )
 
-        return path
+    def _download_ranges(
+        self,
+        url: str,
+        outpath: pathlib.Path,
+        start: int,
+        size: int,
+        validator: str,
+        nconnections: int,
+        chunk_size: int | None,
+        pbar: tqdm,
+    ) -> None:
+        """Download [start, size) in `nconnections` parallel range requests.
+
+        Every `CHECKPOINT_INTERVAL` seconds, and in case of failure, the
+        amount of data downloaded contiguously from the beginning of the
+        file is synchronized to disk and recorded (see
+        `_save_resume_offset`), so that the download can be resumed later.
+        """
+        if not chunk_size:
+            chunk_size = self.DEFAULT_CHUNK_SIZE
+        nconnections = max(1, min(nconnections, size - start))
+        step = -(-(size - start) // nconnections)  # ceil division
+        offsets = list(range(start, size, step))
+        lasts = [min(offset + step, size) - 1 for offset in offsets]
+        cancelled = threading.Event()
+
+        def contiguous_end() -> int:
+            return _contiguous_end(start, offsets, lasts)
+
+        def checkpoint(end: int) -> None:
+            # NOTE: data shall be on disk before the state is recorded
+            sync(fd)
+            _save_resume_offset(outpath, size, validator, end)
+
+        sync = getattr(os, "fdatasync", os.fsync)
+        flags = os.O_WRONLY | os.O_CREAT | getattr(os, "O_BINARY", 0)
+        fd = os.open(outpath, flags, 0o666)
+        try:
+            # the state is recorded before pre-allocating the file, so that
+            # a partial download can always be told from a complete one
+            _save_resume_offset(outpath, size, validator, start)
+            if hasattr(os, "posix_fallocate"):
+                try:
+                    os.posix_fallocate(fd, start, size - start)
+                except OSError as exc:
+                    _log.debug("unable to pre-allocate '%s': %s", outpath, exc)
+
+            with pbar, ThreadPoolExecutor(len(offsets)) as executor:
+                futures = [
+                    executor.submit(
+                        self._download_range,
+                        url,
+                        fd,
+                        index,
+                        offsets,
+                        last,
+                        validator,
+                        chunk_size,
+                        pbar,
+                        cancelled,
+                    )
+                    for index, last in enumerate(lasts)
+                ]
+                try:
+                    self._wait_ranges(
+                        futures, start, contiguous_end, checkpoint
+                    )
+                except BaseException:
+                    cancelled.set()
+                    raise
+
+            # discard any trailing data of previous downloads
+            os.ftruncate(fd, size)
+        except BaseException:
+            # keep only the data downloaded contiguously from `start`
+            end = contiguous_end()
+            os.ftruncate(fd, end)
+            checkpoint(end)
+            raise
+        finally:
+            os.close(fd)
+
+    def _wait_ranges(
+        self,
+        futures: Iterable[Future],
+        start: int,
+        contiguous_end: Callable[[], int],
+        checkpoint: Callable[[int], None],
+    ) -> None:
+        """Wait for the completion of the range downloads in `futures`.
+
+        Every `CHECKPOINT_INTERVAL` seconds the amount of data downloaded
+        contiguously from `start` is passed to `checkpoint` (if changed).
+        The first exception raised by a range download is re-raised.
+        """
+        pending: set[Future] = set(futures)
+        saved = start
+        while pending:
+            done, pending = wait(
+                pending,
+                timeout=self.CHECKPOINT_INTERVAL,
+                return_when=FIRST_EXCEPTION,
+            )
+            for future in done:
+                future.result()
+            if pending and (end := contiguous_end()) > saved:
+                checkpoint(end)
+                saved = end
+
+    @classmethod
+    def _write_stream(
+        cls,
+        response: requests.Response,
+        outpath: pathlib.Path,
+        data_size: int,
+        chunk_size: int | None,
+        pbar: tqdm,
+    ) -> None:
+        if not chunk_size:
+            chunk_size = cls.DEFAULT_CHUNK_SIZE
+        # decode the content only if it is actually encoded
+        encoding = response.headers.get("Content-Encoding", "identity")
+        identity = encoding.lower() == "identity"
+        raw = response.raw
+        raw.decode_content = not identity
+        with open(outpath, "wb") as fd, pbar, _translate_read_errors():
+            fileno = fd.fileno()
+            preallocated = False
+            if data_size > 0 and hasattr(os, "posix_fallocate"):
+                # reserve the disk space in advance to reduce fragmentation
+                try:
+                    os.posix_fallocate(fileno, 0, data_size)
+                except OSError as exc:
+                    _log.debug("unable to pre-allocate '%s': %s", outpath, exc)
+                else:
+                    preallocated = True
+
+            # Data written to disk are never read back, so they are dropped
+            # from the page cache as the download proceeds.
+            # NOTE: the kernel does not drop dirty pages, so only blocks
+            # older than PAGE_CACHE_DROP_SIZE, that are likely already
+            # written back to disk, are advised.
+            drop_size = cls.PAGE_CACHE_DROP_SIZE
+            use_fadvise = hasattr(os, "posix_fadvise")
+
+            # the progress bar is updated every PROGRESS_UPDATE_SIZE bytes
+            update_size = cls.PROGRESS_UPDATE_SIZE
+            reported = 0
+
+            written = 0
+            dropped = 0
+            try:
+                while chunk := raw.read(chunk_size):
+                    written += fd.write(chunk)
+                    if written - reported >= update_size:
+                        pbar.update(written - reported)
+                        reported = written
+                    if use_fadvise and written - dropped >= 2 * drop_size:
+                        os.posix_fadvise(
+                            fileno, dropped, drop_size, os.POSIX_FADV_DONTNEED
+                        )
+                        dropped += drop_size
+            finally:
+                pbar.update(written - reported)
+                if preallocated:
+                    # the decoded data size can differ from "Content-Length",
+                    # moreover the file size shall always match the
+                    # downloaded data (also in case of failure)
+                    fd.truncate(written)
+
+    def _download_probed(
+        self,
+        url: str,
+        outpath: pathlib.Path | None,
+        *,
+        outdir: str | None,
+        chunk_size: int | None,
+        disable_progress: bool | None,
+        save_mode: ESaveMode,
+        nconnections: int,
+        resume: bool,
+        leave_progress: bool,
+    ) -> tuple[bool, pathlib.Path | None]:
+        """Probe the remote resource and download it using range requests.
+
+        Return a flag indicating whether the download has been completed
+        (or skipped), and the output path (`None` if not known yet).
+        If range requests are not supported the returned flag is `False`
+        and the resource shall be downloaded sequentially.
+        See `download` for the description of parameters.
+        """
+        # the HEAD request is cheap: overlap it with the filesystem
+        # check of the output path (e.g. stat on slow NFS mounts)
+        with ThreadPoolExecutor(1) as executor:
+            future = None
+            if outpath is not None:
+                future = executor.submit(_check_path, outpath, save_mode)
+            size, accept_ranges, headers = self._head(url)
+        if future is not None:
+            outpath = future.result()
+            if outpath is None:
+                return True, None
+        else:
+            outfile = _get_filename_from_headers(headers)
+            if outfile:
+                outpath = _resolve_path(
+                    pathlib.Path(outfile), outdir, save_mode
+                )
+                if outpath is None:
+                    return True, None
+
+        if outpath is None or not accept_ranges or size <= 0:
+            _log.debug("range requests not supported for '%s'", url)
+            return False, outpath
+
+        partpath = _part_path(outpath)
+        with self._claim(partpath):
+            validator = _get_validator(headers)
+            start = 0
+            if resume:
+                start = _load_resume_offset(partpath, size, validator)
+            if start == 0:
+                # the state of previous downloads is no longer valid
+                _state_path(partpath).unlink(missing_ok=True)
+
+            outpath.parent.mkdir(exist_ok=True, parents=True)
+            if start < size:
+                pbar = self._progress_bar(
+                    outpath.name,
+                    size,
+                    initial=start,
+                    disable=disable_progress,
+                    leave=leave_progress,
+                )
+                self._download_ranges(
+                    url,
+                    partpath,
+                    start,
+                    size,
+                    validator,
+                    nconnections,
+                    chunk_size,
+                    pbar,
+                )
+            os.replace(partpath, outpath)
+            _state_path(partpath).unlink(missing_ok=True)
+        return True, outpath
 
     # https://documentation.dataspace.copernicus.eu/APIs/OData.html#product-download
     def download(
@@ -85,6 +663,9 @@ class CdseODataClient:
         chunk_size: int | None = DEFAULT_CHUNK_SIZE,
         disable_progress: bool | None = None,
         save_mode: ESaveMode = ESaveMode.NOT_OVERWRITE,
+        nconnections: int = 1,
+        resume: bool = False,
+        leave_progress: bool = True,
     ):
         """Download the file at the specified URL.
 
@@ -94,51 +675,150 @@ class CdseODataClient:
         deduced by the HTTP(S) response.
         If it is not possible an error is raised.
 
-        If the output file already exists a `FileExistsError` exception is
-        raised.
-        """
-        if outfile:
-            self._new_path(outfile, outdir=outdir, save_mode=save_mode)
+        If the output file already exists, depending on `save_mode`, the
+        download is skipped, the file is overwritten or a `FileExistsError`
+        exception is raised.
 
-        response = self.session.get(url, stream=True)
-        response.raise_for_status()
+        Data are downloaded in a temporary file (with the ".part" suffix)
+        that is renamed to the output file only when the download is
+        complete.
 
-        # Check if the request was successful
-        if response.status_code != 200:
-            raise RuntimeError(
-                f"Failed to download file. Status code: {response.status_code}"
+        If the server supports range requests, the file can be downloaded
+        using `nconnections` parallel connections.
+        If `resume` is set to `True`, and the temporary file of a previous
+        partial download exists, only the missing part is downloaded.
+        The progress of range downloads is tracked in a state file (with
+        the ".part.json" suffix); partial downloads without a valid state,
+        or whose remote file has changed, are restarted from scratch.
+        """
+        probe = (nconnections > 1 or resume) and _HAS_PWRITE
+        outpath = pathlib.Path(outfile) if outfile else None
+        if outpath is not None:
+            outpath = _output_path(outpath, outdir)
+            if not probe:
+                # NOTE: the output path is checked before sending the GET
+                # request, to avoid starting downloads that will be skipped
+                outpath = _check_path(outpath, save_mode)
+                if outpath is None:
+                    return
+
+        if probe:
+            done, outpath = self._download_probed(
+                url,
+                outpath,
+                outdir=outdir,
+                chunk_size=chunk_size,
+                disable_progress=disable_progress,
+                save_mode=save_mode,
+                nconnections=nconnections,
+                resume=resume,
+                leave_progress=leave_progress,
             )
+            if done:
+                return
 
-        if not outfile:
-            outfile = self._get_filename_from_headers(response.headers)
+        with self._open_stream(url) as response:
+            if outpath is None:
+                outfile = _get_filename_from_headers(response.headers)
+                outpath = _resolve_path(
+                    pathlib.Path(outfile), outdir, save_mode
+                )
+                if outpath is None:
+                    return
 
-        outpath = self._new_path(outfile, outdir=outdir, save_mode=save_mode)
-        if outpath.exists() and save_mode is ESaveMode.NOT_OVERWRITE:
-            _log.info("file '%s' already exists, skip download", outpath)
-            return
+            partpath = _part_path(outpath)
+            with self._claim(partpath):
+                outpath.parent.mkdir(exist_ok=True, parents=True)
 
-        outpath.parent.mkdir(exist_ok=True, parents=True)
+                data_size = int(response.headers.get("Content-Length", 0))
+                pbar = self._progress_bar(
+                    str(outfile),
+                    data_size,
+                    disable=disable_progress,
+                    leave=leave_progress,
+                )
+                # the temporary file is re-written from scratch
+                _state_path(partpath).unlink(missing_ok=True)
+                self._write_stream(
+                    response, partpath, data_size, chunk_size, pbar
+                )
+                os.replace(partpath, outpath)
 
-        data_size = int(response.headers.get("Content-Length", 0))
-        pbar = tqdm(
-            desc=str(outfile),
-            total=data_size,
-            unit="B",
-            unit_scale=True,
-            unit_divisor=1024,
-            disable=disable_progress,
-        )
-        with open(outpath, "wb") as fd, pbar:
-            for chunk in response.iter_content(chunk_size=chunk_size):
-                if chunk:  # filter out keep-alive new chunks
-                    size = fd.write(chunk)
-                    pbar.update(size)
+    def download_many(
+        self,
+        urls: Iterable[str],
+        *,
+        outdir: str | None = None,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        chunk_size: int | None = DEFAULT_CHUNK_SIZE,
+        disable_progress: bool | None = None,
+        save_mode: ESaveMode = ESaveMode.NOT_OVERWRITE,
+    ):
+        """Download in parallel the files at the specified URLs.
+
+        Files are downloaded concurrently by `max_workers` threads sharing
+        the same HTTP(S) session (and connection pool).
+        The name of each output file is deduced by the HTTP(S) response,
+        and the file is stored in `outdir` (if specified).
+
+        The value of `max_workers` should not exceed the size of the
+        session connection pool (see `CdseSession`).
+
+        Duplicate URLs are downloaded only once.
+        If a download fails, the downloads not yet started are cancelled
+        and, once the running ones are completed, all the errors are
+        raised in an `ExceptionGroup`.
+        """
+        urls = list(dict.fromkeys(urls))
+        errors: list[Exception] = []
+        with (
+            ThreadPoolExecutor(max_workers=max_workers) as executor,
+            tqdm(
+                desc="files",
+                total=len(urls),
+                unit="file",
+                disable=disable_progress,
+            ) as pbar,
+        ):
+            futures = {
+                executor.submit(
+                    self.download,
+                    url,
+                    outdir=outdir,
+                    chunk_size=chunk_size,
+                    disable_progress=disable_progress,
+                    save_mode=save_mode,
+                    leave_progress=False,
+                ): url
+                for url in urls
+            }
+            pending = set(futures)
+            try:
+                while pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        try:
+                            future.result()
+                        except Exception as exc:  # noqa: BLE001
+                            exc.add_note(f"URL: {futures[future]}")
+                            errors.append(exc)
+                        else:
+                            pbar.update(1)
+                    if errors:
+                        # do not start queued downloads
+                        # NOTE: cancelled futures are never reported by `wait`
+                        executor.shutdown(wait=False, cancel_futures=True)
+                        pending = {f for f in pending if not f.cancelled()}
+            except BaseException:
+                # e.g. KeyboardInterrupt
+                executor.shutdown(wait=False, cancel_futures=True)
+                raise
+
+        if errors:
+            raise ExceptionGroup(f"{len(errors)} download(s) failed", errors)
 
     def __enter__(self):
         return self
 
     def __exit__(self, exc_type, exc_value, traceback):
-        self.session.close()
-
-    def __del__(self):
-        self.session.close()
+        self._finalizer()
@@ -1,14 +1,23 @@
 """Support tools for OAuth API."""
 
+import functools
+
 import requests
 
 CDSE_OAUTH_BASE_URL = "https://catalogue.dataspace.copernicus.eu/odata/v1"
 
+_session = requests.Session()
+
+
+@functools.lru_cache(maxsize=1)
+def get_collections() -> tuple[str, ...]:
+    """Return the list of collections available on CDSE via Odata API.
 
-def get_collections() -> list[str]:
-    """Return the list of collections available on CDSE via Odata API."""
+    The result is cached, use `get_collections.cache_clear()` to force
+    a new request to the server.
+    """
     url = f"{CDSE_OAUTH_BASE_URL}/Attributes"
-    response = requests.get(url)
+    response = _session.get(url, timeout=30)
     response.raise_for_status()
     data = response.json()
-    return list(data.keys())
+    return tuple(data.keys())
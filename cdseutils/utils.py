@@ -1,6 +1,10 @@
 """Utility functions and classes."""
 
 from typing import NamedTuple
+from collections.abc import Iterable, Sequence
+
+import numpy as np
+import numpy.typing as npt
 
 
 class BBox(NamedTuple):
@@ -12,14 +16,132 @@ class BBox(NamedTuple):
     top: float = +90
 
 
-def deg2dms(value: float) -> tuple[int, int, float]:
-    """Convert angles from decimal degrees to (deg, min, sec) format."""
-    sign = -1 if value < 0 else 1
-    minutes, seconds = divmod(abs(value) * 3600, 60)
-    degrees, minutes = divmod(minutes, 60)
-    return sign * int(degrees), int(minutes), seconds
+_BBOX_FIELDS = ("left", "bottom", "right", "top")
+_BBOX_DTYPE = np.dtype([(name, "<f8") for name in _BBOX_FIELDS])
+
+
+def _as_coordinate_arrays(
+    *coords: npt.ArrayLike,
+) -> Sequence[np.ndarray]:
+    """Convert coordinates to float64 arrays broadcast to the same shape."""
+    return np.broadcast_arrays(
+        *(np.asarray(item, dtype=np.float64) for item in coords)
+    )
+
+
+def bboxes(
+    left: npt.ArrayLike,
+    bottom: npt.ArrayLike,
+    right: npt.ArrayLike,
+    top: npt.ArrayLike,
+) -> np.recarray:
+    """Build a record array of bounding boxes.
+
+    All the bounding boxes are stored in a single contiguous memory
+    block, with fields "left", "bottom", "right" and "top".
+    """
+    arrays = _as_coordinate_arrays(left, bottom, right, top)
+    return np.rec.fromarrays(arrays, dtype=_BBOX_DTYPE)
+
+
+class BBoxArray:
+    """Array of bounding boxes.
+
+    Bounding boxes are stored as a structure of arrays, i.e. one array of
+    coordinates for each side (left, bottom, right, top), to allow fast
+    vectorized operations on large sets of bounding boxes.
+    """
+
+    __slots__ = _BBOX_FIELDS
+
+    def __init__(
+        self,
+        left: npt.ArrayLike,
+        bottom: npt.ArrayLike,
+        right: npt.ArrayLike,
+        top: npt.ArrayLike,
+    ):
+        arrays = _as_coordinate_arrays(left, bottom, right, top)
+        self.left, self.bottom, self.right, self.top = arrays
+
+    @classmethod
+    def from_bboxes(cls, bboxes: Iterable[BBox]) -> "BBoxArray":
+        """Build a `BBoxArray` from a sequence of `BBox` objects."""
+        data = np.array(list(bboxes), dtype=np.float64).reshape(-1, 4)
+        return cls(*data.T)
+
+    @classmethod
+    def from_records(cls, records: np.ndarray) -> "BBoxArray":
+        """Build a `BBoxArray` from a record array (see `bboxes`)."""
+        return cls(*(records[name] for name in _BBOX_FIELDS))
+
+    def to_records(self) -> np.recarray:
+        """Return bounding boxes as a record array (see `bboxes`)."""
+        return bboxes(self.left, self.bottom, self.right, self.top)
+
+    def __len__(self) -> int:
+        return len(self.left)
+
+    def __getitem__(self, index: int) -> BBox:
+        return BBox(
+            float(self.left[index]),
+            float(self.bottom[index]),
+            float(self.right[index]),
+            float(self.top[index]),
+        )
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(<{len(self)} bounding boxes>)"
+
+    def intersects(self, other: BBox) -> np.ndarray:
+        """Return a boolean array flagging the boxes intersecting `other`."""
+        return (
+            (self.left < other.right)
+            & (self.right > other.left)
+            & (self.bottom < other.top)
+            & (self.top > other.bottom)
+        )
+
+
+def deg2dms(value: float | npt.ArrayLike):
+    """Convert angles from decimal degrees to (deg, min, sec) format.
+
+    Both scalars and arrays of angles are supported.
+    In case of arrays a tuple of three arrays (deg, min, sec) is returned.
+    """
+    if isinstance(value, (int, float)):
+        sign = -1 if value < 0 else 1
+        minutes, seconds = divmod(abs(value) * 3600, 60)
+        degrees, minutes = divmod(minutes, 60)
+        return sign * int(degrees), int(minutes), seconds
+
+    value = np.asarray(value, dtype=np.float64)
+    signs = np.where(value < 0, -1, 1)
+    minutes, seconds = np.divmod(np.abs(value) * 3600, 60)
+    degrees, minutes = np.divmod(minutes, 60)
+    return (
+        signs * degrees.astype(np.int64),
+        minutes.astype(np.int64),
+        seconds,
+    )
+
 
+def dms2deg(
+    deg: int | npt.ArrayLike,
+    minutes: int | npt.ArrayLike,
+    seconds: float | npt.ArrayLike,
+):
+    """Convert angles from (deg, min, sec) to decimal degree format.
 
-def dms2deg(deg: int, minutes: int, seconds: float):
-    """Convert angles from (deg, min, sec) to decimal degree format."""
+    Both scalars and arrays of angles are supported.
+    """
+    scalar = (int, float)
+    if not (
+        isinstance(deg, scalar)
+        and isinstance(minutes, scalar)
+        and isinstance(seconds, scalar)
+    ):
+        deg = np.asarray(deg)
+        minutes = np.asarray(minutes)
+        seconds = np.asarray(seconds)
     return deg + minutes / 60 + seconds / 3600
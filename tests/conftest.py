@@ -0,0 +1,96 @@
+import os
+import re
+import threading
+import http.server
+
+import pytest
+
+DATA = os.urandom(3 * 1024 * 1024 + 123)
+ETAG = '"v1"'
+
+
+class RangeRequestHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    data = DATA
+    etag = ETAG
+    requests: list[str] = []
+    ranges: list[str] = []
+    # (method, "Accept-Encoding" header) of each request
+    accept_encodings: list[tuple[str, str | None]] = []
+    # if set, the connection is dropped after sending the specified amount
+    # of data of the first response
+    fail_after: int | None = None
+    # if not set, HEAD requests are rejected with "405 Method Not Allowed"
+    allow_head = True
+
+    def log_message(self, *args):
+        pass
+
+    def _send_headers(self) -> bytes | None:
+        if "missing" in self.path:
+            self.send_error(404)
+            return None
+        self.requests.append(f"{self.command} {self.path}")
+        accept_encoding = self.headers.get("Accept-Encoding")
+        self.accept_encodings.append((self.command, accept_encoding))
+        data = self.data
+        rng = self.headers.get("Range")
+        if_range = self.headers.get("If-Range")
+        if rng and (if_range is None or if_range == self.etag):
+            self.ranges.append(rng)
+            first, last = re.match(r"bytes=(\d+)-(\d*)", rng).groups()
+            first = int(first)
+            last = int(last) if last else len(data) - 1
+            body = data[first : last + 1]
+            self.send_response(206)
+            self.send_header(
+                "Content-Range", f"bytes {first}-{last}/{len(data)}"
+            )
+        else:
+            body = data
+            self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("ETag", self.etag)
+        filename = self.path.rpartition("/")[2]
+        self.send_header(
+            "Content-Disposition", f'attachment; filename="{filename}"'
+        )
+        self.end_headers()
+        return body
+
+    def do_HEAD(self):
+        if not self.allow_head:
+            self.send_error(405)
+            return
+        self._send_headers()
+
+    def do_GET(self):
+        body = self._send_headers()
+        if body is None:
+            return
+        if self.fail_after is not None:
+            body = body[: self.fail_after]
+            RangeRequestHandler.fail_after = None
+            self.close_connection = True
+        try:
+            self.wfile.write(body)
+        except ConnectionError:
+            pass
+
+
+@pytest.fixture
+def url():
+    RangeRequestHandler.requests = []
+    RangeRequestHandler.ranges = []
+    RangeRequestHandler.accept_encodings = []
+    RangeRequestHandler.fail_after = None
+    RangeRequestHandler.allow_head = True
+    server = http.server.ThreadingHTTPServer(
+        ("127.0.0.1", 0), RangeRequestHandler
+    )
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/product.zip"
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,74 @@
+import json
+import asyncio
+
+import httpx
+import pytest
+
+from cdseutils.clients import _part_path, _state_path
+from cdseutils.aclients import AsyncCdseODataClient
+
+from .conftest import DATA, RangeRequestHandler
+
+
+def _download(url, outpath, outfile=True, **kwargs):
+    async def download():
+        async with AsyncCdseODataClient() as client:
+            await client.download(
+                url,
+                outpath.name if outfile else None,
+                outdir=str(outpath.parent),
+                disable_progress=True,
+                **kwargs,
+            )
+
+    asyncio.run(download())
+
+
+@pytest.mark.parametrize("outfile", [True, False])
+def test_download(url, tmp_path, outfile):
+    outpath = tmp_path / "product.zip"
+    _download(url, outpath, outfile=outfile)
+    assert outpath.read_bytes() == DATA
+    assert not _part_path(outpath).exists()
+    assert RangeRequestHandler.accept_encodings == [("GET", "identity")]
+
+
+def test_download_removes_stale_state(url, tmp_path):
+    outpath = tmp_path / "product.zip"
+    partpath = _part_path(outpath)
+    partpath.write_bytes(bytes(1024))
+    _state_path(partpath).write_text(
+        json.dumps({"size": len(DATA), "validator": "", "end": 1024})
+    )
+    _download(url, outpath)
+    assert outpath.read_bytes() == DATA
+    assert not _state_path(partpath).exists()
+
+
+def test_download_failure(url, tmp_path):
+    outpath = tmp_path / "product.zip"
+    end = 1024 * 1024 + 17
+    RangeRequestHandler.fail_after = end
+    with pytest.raises(httpx.HTTPError):
+        _download(url, outpath, chunk_size=64 * 1024)
+    assert not outpath.exists()
+    # the pre-allocated file only contains the received data
+    data = _part_path(outpath).read_bytes()
+    assert 0 < len(data) <= end
+    assert data == DATA[: len(data)]
+
+
+def test_claim(tmp_path):
+    partpath = tmp_path / "product.zip.part"
+
+    async def claim():
+        async with AsyncCdseODataClient() as client:
+            with client._claim(partpath):
+                with pytest.raises(FileExistsError):
+                    with client._claim(partpath):
+                        pass
+            # released
+            with client._claim(partpath):
+                pass
+
+    asyncio.run(claim())
@@ -0,0 +1,145 @@
+import asyncio
+from urllib.parse import parse_qsl
+
+import httpx
+import pytest
+
+from cdseutils.aioauth import AsyncCdseToken, AsyncCdseSession
+
+AUTH_SERVER_URL = "https://auth.example.com/token"
+
+
+class TokenServer:
+    """Stub of the authentication server (see `httpx.MockTransport`)."""
+
+    def __init__(self):
+        self.grants = []
+        self.revoked = False
+        self.expires_in = 600
+
+    def __call__(self, request):
+        data = dict(parse_qsl(request.content.decode()))
+        self.grants.append(data["grant_type"])
+        if data["grant_type"] == "refresh_token" and self.revoked:
+            return httpx.Response(400, json={"error": "invalid_grant"})
+        index = len(self.grants)
+        return httpx.Response(
+            200,
+            json={
+                "access_token": f"access-{index}",
+                "refresh_token": f"refresh-{index}",
+                "expires_in": self.expires_in,
+                "refresh_expires_in": 3600,
+            },
+        )
+
+
+@pytest.fixture
+def server():
+    return TokenServer()
+
+
+def _run(server, coro):
+    async def main():
+        transport = httpx.MockTransport(server)
+        async with httpx.AsyncClient(transport=transport) as client:
+            token = AsyncCdseToken(
+                "user",
+                "password",
+                auth_server_url=AUTH_SERVER_URL,
+                client=client,
+            )
+            return await coro(token)
+
+    return asyncio.run(main())
+
+
+def test_token_reuse(server):
+    async def get(token):
+        return [await token.get(), await token.get()]
+
+    assert _run(server, get) == ["access-1", "access-1"]
+    assert server.grants == ["password"]
+
+
+def test_token_concurrent_get(server):
+    async def get(token):
+        return await asyncio.gather(*(token.get() for _ in range(5)))
+
+    assert _run(server, get) == ["access-1"] * 5
+    assert server.grants == ["password"]
+
+
+def test_token_short_lifetime(server):
+    # shorter than the expiry skew (30s)
+    server.expires_in = 20
+
+    async def get(token):
+        return [await token.get(), await token.get()]
+
+    assert _run(server, get) == ["access-1", "access-1"]
+    assert server.grants == ["password"]
+
+
+def test_token_refresh(server):
+    async def get(token):
+        await token.get()
+        token._access_deadline = 0  # expired access token
+        return await token.get()
+
+    assert _run(server, get) == "access-2"
+    assert server.grants == ["password", "refresh_token"]
+
+
+def test_token_expired_refresh(server):
+    async def get(token):
+        await token.get()
+        token._access_deadline = token._refresh_deadline = 0
+        return await token.get()
+
+    assert _run(server, get) == "access-2"
+    assert server.grants == ["password", "password"]
+
+
+def test_token_revoked_refresh(server):
+    async def get(token):
+        await token.get()
+        token._access_deadline = 0
+        server.revoked = True
+        return await token.get()
+
+    # fall back to the password grant
+    assert _run(server, get) == "access-3"
+    assert server.grants == ["password", "refresh_token", "password"]
+
+
+@pytest.mark.parametrize(
+    ("location", "forwarded"),
+    [
+        ("https://trusted.example.com/data", True),
+        ("https://other.example.com/data", False),
+        ("http://trusted.example.com/data", False),
+    ],
+)
+def test_redirect_headers(location, forwarded):
+    received = {}
+
+    def handler(request):
+        if request.url.host == "api.example.com":
+            return httpx.Response(302, headers={"Location": location})
+        received.update(request.headers)
+        return httpx.Response(200)
+
+    async def main():
+        async with AsyncCdseSession(
+            "token",
+            trusted_domains=["trusted.example.com"],
+            transport=httpx.MockTransport(handler),
+        ) as session:
+            response = await session.get("https://api.example.com/data")
+            response.raise_for_status()
+
+    asyncio.run(main())
+    assert ("authorization" in received) is forwarded
+    if forwarded:
+        assert received["authorization"] == "Bearer token"
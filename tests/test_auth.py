@@ -0,0 +1,32 @@
+import pytest
+
+from cdseutils.auth import AuthData, get_auth_from_netrc
+
+URL = "https://auth.example.com/token"
+
+
+def _write_netrc(path, password):
+    path.write_text(
+        f"machine auth.example.com login user password {password}\n"
+    )
+
+
+def test_get_auth_from_netrc(tmp_path):
+    netrc_path = tmp_path / "netrc"
+    _write_netrc(netrc_path, "secret")
+    auth = get_auth_from_netrc(URL, netrc_path)
+    assert auth == AuthData("user", "secret")
+
+
+def test_get_auth_from_modified_netrc(tmp_path):
+    netrc_path = tmp_path / "netrc"
+    _write_netrc(netrc_path, "secret")
+    assert get_auth_from_netrc(URL, netrc_path).password == "secret"
+    # the modified file is re-loaded
+    _write_netrc(netrc_path, "new-secret")
+    assert get_auth_from_netrc(URL, netrc_path).password == "new-secret"
+
+
+def test_get_auth_from_missing_netrc(tmp_path):
+    with pytest.raises(FileExistsError):
+        get_auth_from_netrc(URL, tmp_path / "netrc")
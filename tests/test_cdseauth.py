@@ -0,0 +1,98 @@
+import json
+import time
+
+import pytest
+import requests
+
+from cdseutils.cdseauth import CdseToken
+
+AUTH_SERVER_URL = "https://auth.example.com/token"
+
+
+class StubSession:
+    """Stub of the `requests.Session` used to reach the auth server."""
+
+    def __init__(self):
+        self.grants = []
+        self.revoked = False
+
+    def post(self, url, data, **kwargs):
+        self.grants.append(data["grant_type"])
+        response = requests.Response()
+        response.url = url
+        if data["grant_type"] == "refresh_token" and self.revoked:
+            response.status_code = 400
+            response._content = b'{"error": "invalid_grant"}'
+            return response
+        index = len(self.grants)
+        response.status_code = 200
+        response._content = json.dumps({
+            "access_token": f"access-{index}",
+            "refresh_token": f"refresh-{index}",
+            "expires_in": 600,
+            "refresh_expires_in": 3600,
+        }).encode()
+        return response
+
+
+@pytest.fixture
+def session():
+    return StubSession()
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return tmp_path / "token.json"
+
+
+def _token(session, cache_path, username="user", url=AUTH_SERVER_URL):
+    return CdseToken(
+        username,
+        "password",
+        auth_server_url=url,
+        session=session,
+        cache_path=cache_path,
+    )
+
+
+def _expire_access_token(cache_path):
+    data = json.loads(cache_path.read_text())
+    data["access_expiration_time"] = time.time() - 1
+    cache_path.write_text(json.dumps(data))
+
+
+def test_token_cache_reuse(session, cache_path):
+    assert _token(session, cache_path).get() == "access-1"
+    assert _token(session, cache_path).get() == "access-1"
+    assert session.grants == ["password"]
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [{"username": "other"}, {"url": "https://other.example.com/token"}],
+)
+def test_token_cache_mismatch(session, cache_path, kwargs):
+    _token(session, cache_path)
+    assert _token(session, cache_path, **kwargs).get() == "access-2"
+    assert session.grants == ["password", "password"]
+
+
+def test_token_cache_expired_access_token(session, cache_path):
+    _token(session, cache_path)
+    _expire_access_token(cache_path)
+    token = _token(session, cache_path)
+    assert session.grants == ["password"]
+    assert token.get() == "access-2"
+    assert session.grants == ["password", "refresh_token"]
+
+
+def test_token_cache_revoked_refresh_token(session, cache_path):
+    _token(session, cache_path)
+    _expire_access_token(cache_path)
+    session.revoked = True
+    token = _token(session, cache_path)
+    # fall back to the password grant
+    assert token.get() == "access-3"
+    assert session.grants == ["password", "refresh_token", "password"]
+    # the cached tokens are replaced
+    assert _token(session, cache_path).get() == "access-3"
@@ -0,0 +1,187 @@
+import json
+
+import pytest
+import requests
+
+from cdseutils.clients import (
+    CdseODataClient,
+    _part_path,
+    _state_path,
+    _get_filename_from_headers,
+)
+
+from .conftest import DATA, ETAG, RangeRequestHandler
+
+
+@pytest.fixture
+def client():
+    with CdseODataClient() as client:
+        yield client
+
+
+def _download(client, url, outpath, **kwargs):
+    client.download(
+        url,
+        outpath.name,
+        outdir=str(outpath.parent),
+        disable_progress=True,
+        resume=True,
+        **kwargs,
+    )
+
+
+def _write_state(partpath, end, validator=ETAG):
+    _state_path(partpath).write_text(
+        json.dumps({"size": len(DATA), "validator": validator, "end": end})
+    )
+
+
+@pytest.mark.parametrize(
+    ("content_disposition", "filename"),
+    [
+        ('attachment; filename="product.zip"', "product.zip"),
+        ("attachment; filename*=UTF-8''Sentinel%2D1.zip", "Sentinel-1.zip"),
+        ("attachment; filename*=UTF-8''..%2F..%2Fevil", "evil"),
+        ('attachment; filename="/tmp/product.zip"', "product.zip"),
+    ],
+)
+def test_get_filename_from_headers(content_disposition, filename):
+    headers = {"Content-Disposition": content_disposition}
+    assert _get_filename_from_headers(headers) == filename
+
+
+@pytest.mark.parametrize(
+    "content_disposition",
+    ['attachment; filename=""', 'attachment; filename=".."', "attachment"],
+)
+def test_get_filename_from_headers_invalid(content_disposition):
+    headers = {"Content-Disposition": content_disposition}
+    with pytest.raises(ValueError):
+        _get_filename_from_headers(headers)
+
+
+@pytest.mark.parametrize("nconnections", [1, 3])
+def test_download_ranges(client, url, tmp_path, nconnections):
+    outpath = tmp_path / "product.zip"
+    _download(client, url, outpath, nconnections=nconnections)
+    assert outpath.read_bytes() == DATA
+    assert not _part_path(outpath).exists()
+    assert not _state_path(_part_path(outpath)).exists()
+
+
+@pytest.mark.parametrize("with_state", [False, True])
+def test_resume_after_crash_with_preallocated_part(
+    client, url, tmp_path, with_state
+):
+    # a hard kill leaves a pre-allocated temporary file
+    outpath = tmp_path / "product.zip"
+    partpath = _part_path(outpath)
+    partpath.write_bytes(bytes(len(DATA)))
+    if with_state:
+        _write_state(partpath, 0)
+    _download(client, url, outpath)
+    assert outpath.read_bytes() == DATA
+    assert RangeRequestHandler.ranges == [f"bytes=0-{len(DATA) - 1}"]
+
+
+def test_resume_existing_output_file(client, url, tmp_path):
+    outpath = tmp_path / "product.zip"
+    outpath.write_bytes(DATA[:1024])
+    _download(client, url, outpath)
+    assert outpath.read_bytes() == DATA[:1024]
+    assert RangeRequestHandler.ranges == []
+
+
+def test_resume_after_failure(client, url, tmp_path):
+    outpath = tmp_path / "product.zip"
+    partpath = _part_path(outpath)
+    end = 1024 * 1024 + 17
+    RangeRequestHandler.fail_after = end
+    with pytest.raises(requests.exceptions.ChunkedEncodingError):
+        _download(client, url, outpath, chunk_size=64 * 1024)
+    assert not outpath.exists()
+    assert partpath.stat().st_size == end
+    state = json.loads(_state_path(partpath).read_text())
+    assert state == {"size": len(DATA), "validator": ETAG, "end": end}
+
+    _download(client, url, outpath)
+    assert outpath.read_bytes() == DATA
+    assert RangeRequestHandler.ranges[-1] == f"bytes={end}-{len(DATA) - 1}"
+
+
+def test_resume_from_state(client, url, tmp_path):
+    outpath = tmp_path / "product.zip"
+    partpath = _part_path(outpath)
+    end = 1024 * 1024
+    # only the first `end` bytes are known to be on disk
+    partpath.write_bytes(DATA[:end] + bytes(len(DATA) - end))
+    _write_state(partpath, end)
+    _download(client, url, outpath)
+    assert outpath.read_bytes() == DATA
+    assert RangeRequestHandler.ranges == [f"bytes={end}-{len(DATA) - 1}"]
+
+
+def test_resume_changed_remote_file(client, url, tmp_path):
+    outpath = tmp_path / "product.zip"
+    partpath = _part_path(outpath)
+    end = 1024 * 1024
+    partpath.write_bytes(bytes(end))
+    _write_state(partpath, end, validator='"v0"')
+    _download(client, url, outpath)
+    assert outpath.read_bytes() == DATA
+    assert RangeRequestHandler.ranges == [f"bytes=0-{len(DATA) - 1}"]
+
+
+@pytest.mark.parametrize("nconnections", [1, 3])
+def test_download_without_head(client, url, tmp_path, nconnections):
+    RangeRequestHandler.allow_head = False
+    outpath = tmp_path / "product.zip"
+    _download(client, url, outpath, nconnections=nconnections)
+    assert outpath.read_bytes() == DATA
+    # the resource is probed requesting its first byte
+    assert RangeRequestHandler.ranges[0] == "bytes=0-0"
+    assert len(RangeRequestHandler.ranges) == 1 + nconnections
+
+
+@pytest.mark.parametrize(
+    ("kwargs", "methods"),
+    [
+        ({}, ["GET"]),
+        ({"nconnections": 3}, ["HEAD", "GET", "GET", "GET"]),
+    ],
+)
+def test_download_accept_encoding(client, url, tmp_path, kwargs, methods):
+    outpath = tmp_path / "product.zip"
+    client.download(
+        url,
+        outpath.name,
+        outdir=str(tmp_path),
+        disable_progress=True,
+        **kwargs,
+    )
+    assert outpath.read_bytes() == DATA
+    # products are never re-encoded (GET, HEAD and range requests)
+    accept_encodings = RangeRequestHandler.accept_encodings
+    assert [method for method, _ in accept_encodings] == methods
+    assert all(value == "identity" for _, value in accept_encodings)
+
+
+def test_download_many_duplicates(client, url, tmp_path):
+    client.download_many(
+        [url, url], outdir=str(tmp_path), disable_progress=True
+    )
+    assert (tmp_path / "product.zip").read_bytes() == DATA
+    assert RangeRequestHandler.requests == ["GET /product.zip"]
+
+
+def test_download_many_failure(client, url, tmp_path):
+    base = url.rpartition("/")[0]
+    urls = [f"{base}/missing.zip"] + [f"{base}/p{i}.zip" for i in range(4)]
+    with pytest.raises(ExceptionGroup) as excinfo:
+        client.download_many(
+            urls, outdir=str(tmp_path), max_workers=1, disable_progress=True
+        )
+    assert len(excinfo.value.exceptions) == 1
+    # queued downloads are cancelled (the worker may have already started
+    # the next one)
+    assert len(list(tmp_path.iterdir())) <= 1
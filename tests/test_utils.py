@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from cdseutils.utils import BBox, BBoxArray, deg2dms, dms2deg
+
+ANGLES = [0.0, 0.5, -0.5, 12.3456, -12.3456, 45.0, -179.99, 180.0]
+BBOXES = [
+    BBox(0, 0, 10, 10),
+    BBox(-20, -20, -10, -10),
+    BBox(5, 5, 15, 15),
+    BBox(10, 0, 20, 10),
+    BBox(-180, -90, 180, 90),
+]
+
+
+def test_deg2dms_array_matches_scalar():
+    degrees, minutes, seconds = deg2dms(ANGLES)
+    for index, value in enumerate(ANGLES):
+        deg, mins, secs = deg2dms(value)
+        assert degrees[index] == deg
+        assert minutes[index] == mins
+        assert seconds[index] == pytest.approx(secs)
+
+
+def test_dms2deg_array_matches_scalar():
+    dms = [deg2dms(value) for value in ANGLES]
+    degrees, minutes, seconds = (list(item) for item in zip(*dms, strict=True))
+    values = dms2deg(degrees, minutes, seconds)
+    assert isinstance(values, np.ndarray)
+    for value, (deg, mins, secs) in zip(values, dms, strict=True):
+        assert value == pytest.approx(dms2deg(deg, mins, secs))
+
+
+@pytest.mark.parametrize("other", BBOXES)
+def test_bbox_array_intersects_matches_scalar(other):
+    def intersects(bbox):
+        return (
+            bbox.left < other.right
+            and bbox.right > other.left
+            and bbox.bottom < other.top
+            and bbox.top > other.bottom
+        )
+
+    result = BBoxArray.from_bboxes(BBOXES).intersects(other)
+    assert result.tolist() == [intersects(bbox) for bbox in BBOXES]